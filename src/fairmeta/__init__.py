@@ -1,4 +1,3 @@
-from importlib.metadata import version
 from .metadata_model import MetadataRecord
 from .uploader_radboudfdp import RadboudFDP
 
@@ -15,24 +15,26 @@ class GrandChallenge:
         slug = slug.strip("/")
         slug = quote(slug, safe="")
         
+        archive_dict = {}
+        challenge_dict = {}
+        num_images = 0
+
         try:
             archive_dict = self._gather_archive(slug)
-        except:
-            logging.log("Couldn't gather data from the archive")
+        except Exception as e:
+            logging.warning("Couldn't gather data from the archive", exc_info=e)
 
         try:
-            challenge_dict = self._gather_challenge(slug)        
-        except:
-            logging.log("Couldn't gather data from challenge")
+            challenge_dict = self._gather_challenge(slug)
+        except Exception as e:
+            logging.warning("Couldn't gather data from challenge", exc_info=e)
 
         try:
-            images = self.client.images.iterate_all(params={'archive': archive_dict["pk"]})
-            for image in images:
-                example_image = image
-                break
-            num_images = len(self.client.images.list(params={'archive': archive_dict["pk"]}))
-        except:
-            logging.log("Couldn't determine number of images")
+            image_page = self.client.images.page(limit=1, params={'archive': archive_dict["pk"]})
+            example_image = image_page[0] if len(image_page) else None
+            num_images = image_page.total_count
+        except Exception as e:
+            logging.warning("Couldn't determine number of images", exc_info=e)
 
         combined_dict = {f'challenge_{k}': v for k, v in challenge_dict.items()}
         combined_dict.update({f'archive_{k}': v for k, v in archive_dict.items()})
@@ -1,16 +1,18 @@
+import sys
 from sempyro.dcat import AccessRights
 from sempyro.dcat.dcat_dataset import Frequency
 from sempyro.hri_dcat import DatasetTheme, DatasetStatus, GeonovumLicences, DistributionStatus
 
-access_rights = {right.name: right for right in AccessRights}
+# Keys are lowercased and interned once here so lookups in _to_enum are a
+# single dict probe without per-call allocation.
+access_rights = {sys.intern(right.name.lower()): right for right in AccessRights}
 
-distributionstatuses = {status.name: status for status in DistributionStatus}
+distributionstatuses = {sys.intern(status.name.lower()): status for status in DistributionStatus}
 
-frequencies = {frequency.name.lower(): frequency for frequency in Frequency}
+frequencies = {sys.intern(frequency.name.lower()): frequency for frequency in Frequency}
 
-licenses = {lic.name: lic.value for lic in GeonovumLicences}
+licenses = {sys.intern(lic.name.lower()): lic.value for lic in GeonovumLicences}
 
-statuses = {status.name: status for status in DatasetStatus}
-
-themes = {theme.name: theme for theme in DatasetTheme}
+statuses = {sys.intern(status.name.lower()): status for status in DatasetStatus}
 
+themes = {sys.intern(theme.name.lower()): theme for theme in DatasetTheme}
@@ -1,11 +1,19 @@
 from .schema_definitions_hri import Agent, Catalog, Dataset, Distribution, Kind
+import functools
 import logging
-from pydantic import BaseModel, AnyHttpUrl, TypeAdapter, ValidationError
+import sys
+from pydantic.main import BaseModel
+from pydantic.networks import AnyHttpUrl
+from pydantic.type_adapter import TypeAdapter
+from pydantic_core import ValidationError
 from sempyro.hri_dcat import HRIVCard, HRIAgent
-from typing import List, Optional
+from types import UnionType
+from typing import List, Optional, Union, get_args, get_origin
 from .mappings import themes, access_rights, frequencies, statuses, licenses#, distributionstatuses
 import warnings
 
+_MISSING = object()
+
 def _is_valid_http_url(value: str) -> bool:
     try:
         TypeAdapter(AnyHttpUrl).validate_python(value)
@@ -13,6 +21,37 @@ def _is_valid_http_url(value: str) -> bool:
     except ValidationError:
         return False
 
+def _annotation_allows_list(annotation) -> bool:
+    """Checks whether a field annotation accepts a list, also inside unions"""
+    origin = get_origin(annotation)
+    if origin is list:
+        return True
+    if origin is Union or origin is UnionType:
+        return any(_annotation_allows_list(arg) for arg in get_args(annotation))
+    return False
+
+@functools.cache
+def _field_plan(model_cls: type) -> tuple:
+    """Precomputes (field_name, is_list_type) pairs once per model class"""
+    return tuple(
+        (field_name, _annotation_allows_list(field.annotation))
+        for field_name, field in model_cls.model_fields.items()
+    )
+
+def _raw_construct(model_cls: type) -> BaseModel:
+    """Creates an empty model instance with field defaults, cheaper than model_construct"""
+    obj = object.__new__(model_cls)
+    defaults = {
+        name: field.get_default(call_default_factory=True)
+        for name, field in model_cls.model_fields.items()
+        if not field.is_required()
+    }
+    object.__setattr__(obj, "__dict__", defaults)
+    object.__setattr__(obj, "__pydantic_fields_set__", set())
+    object.__setattr__(obj, "__pydantic_extra__", None)
+    object.__setattr__(obj, "__pydantic_private__", None)
+    return obj
+
 class MetadataRecord(BaseModel):
     catalog: Catalog
     config: Optional[List[dict]] = None
@@ -21,7 +60,9 @@ class MetadataRecord(BaseModel):
     @classmethod
     def create_metadata_schema_instance(cls, configs : list = None, api_data : dict = None) -> "MetadataRecord":
         """Fills the metadata schema using configs and API data"""
-        schema_obj = cls.model_construct(config=configs, api_data=api_data)
+        schema_obj = _raw_construct(cls)
+        schema_obj.__dict__["config"] = configs
+        schema_obj.__dict__["api_data"] = api_data
         if schema_obj.config is not None:
             if not isinstance(schema_obj.config, list):
                 schema_obj.config = [schema_obj.config]
@@ -33,68 +74,67 @@ class MetadataRecord(BaseModel):
         return schema_obj
     
     def transform_schema(self):
-        """Calls all functions to change fields to Health-RI complient formats"""
-        MetadataRecord._ensure_lists(self)
-        MetadataRecord._string_to_enum(self)
-        MetadataRecord._agent_to_HRIAgent(self)
-        MetadataRecord._kind_to_HRIVCard(self)  
+        """Changes all fields to Health-RI complient formats in a single walk over the schema"""
+        MetadataRecord._transform_node(self)
 
     def validate(self):
         """Validates if mandatory fields have acceptable values"""
-        cleaned = MetadataRecord._drop_none(self)
-        type(self).model_validate(cleaned, strict=True)
+        try:
+            cleaned = self.model_dump(exclude_none=True, warnings=False)
+        except Exception:
+            cleaned = MetadataRecord._drop_none(self)
+        else:
+            MetadataRecord._restore_required(self, cleaned)
+        type(self).__pydantic_validator__.validate_python(cleaned, strict=True)
         logging.info("Validation successful")
 
-    # def validate(self): 
-    #     self.model_validate(self.model_dump()) 
-    #     logging.info("Validation successful") 
-          
     @staticmethod
     def _fill_fields_default(schema_obj, config: dict):
         """Recursively fills in the fields from the config file"""
+        values = schema_obj.__dict__
         try:
             for key, value in config.items():
                 if isinstance(value, list):
                     match key:
                         case "keyword":
-                            setattr(schema_obj, key, getattr(schema_obj, key) + value)
+                            values[key] = getattr(schema_obj, key) + value
                         case _:
-                            setattr(schema_obj, key, value)
+                            values[key] = value
                 else:
                     match key:
                         case "catalog":
-                            if not hasattr(schema_obj, key):
-                                setattr(schema_obj, key, Catalog.model_construct())
-                            MetadataRecord._fill_fields_default(getattr(schema_obj, key), value)
+                            sub = values.get(key)
+                            if sub is None:
+                                sub = values[key] = _raw_construct(Catalog)
+                            MetadataRecord._fill_fields_default(sub, value)
                         case "dataset":
-                            if not hasattr(schema_obj, key):
-                                setattr(schema_obj, key, Dataset.model_construct())
-                            MetadataRecord._fill_fields_default(getattr(schema_obj, key), value)
+                            sub = values.get(key)
+                            if sub is None:
+                                sub = values[key] = _raw_construct(Dataset)
+                            MetadataRecord._fill_fields_default(sub, value)
                         case "distribution":
-                            if not hasattr(schema_obj, key) or getattr(schema_obj, key) == None:
-                                setattr(schema_obj, key, Distribution.model_construct())
-                            MetadataRecord._fill_fields_default(getattr(schema_obj, key), value)
+                            sub = values.get(key)
+                            if sub is None:
+                                sub = values[key] = _raw_construct(Distribution)
+                            MetadataRecord._fill_fields_default(sub, value)
                         case "creator" | "publisher":
-                            if not hasattr(schema_obj, key) or getattr(schema_obj, key) == None:
-                                setattr(schema_obj, key, Agent.model_construct())
-                            MetadataRecord._fill_fields_default(getattr(schema_obj, key), value)
+                            sub = values.get(key)
+                            if sub is None:
+                                sub = values[key] = _raw_construct(Agent)
+                            MetadataRecord._fill_fields_default(sub, value)
                         case "contact_point":
-                            if not hasattr(schema_obj, key) or getattr(schema_obj, key) == None:
-                                setattr(schema_obj, key, Kind.model_construct())
-                            MetadataRecord._fill_fields_default(getattr(schema_obj, key), value)
+                            sub = values.get(key)
+                            if sub is None:
+                                sub = values[key] = _raw_construct(Kind)
+                            MetadataRecord._fill_fields_default(sub, value)
                         case "mapping":
                             pass
                         case _:
                             if value:
-                                try:
-                                    v = getattr(schema_obj, key)
-                                    if v == None:
-                                        raise AttributeError
-                                    else:
-                                        warnings.warn(f"Field value overwritten: {key}: {getattr(schema_obj, key)} with {value}")
-                                        raise AttributeError
-                                except AttributeError:
-                                    setattr(schema_obj, key, value)
+                                current = values.get(key, _MISSING)
+                                if current is not _MISSING and current is not None:
+                                    warnings.warn(f"Field value overwritten: {key}: {current} with {value}")
+                                values[key] = value
 
         except AttributeError as e:
             print("Likely in one of the fields creator, publisher, or contact_point, something else than a dictionary or list was given")
@@ -103,51 +143,95 @@ class MetadataRecord(BaseModel):
 
     @staticmethod
     def _populate_schema(schema_obj, api_data: dict, config: dict):
-        """Recursively fills in the fields from the api data"""
+        """Fills in the fields from the api data through a reverse mapping index"""
+        index = MetadataRecord._build_mapping_index(schema_obj, config)
+        MetadataRecord._apply_api_data(index, api_data)
+
+    @staticmethod
+    def _build_mapping_index(schema_obj, config: dict, index: dict = None) -> dict:
+        """Walks the config once and indexes {api_field: [(target_obj, internal_field), ...]}"""
+        if index is None:
+            index = {}
         for field, value in config.items():
             match field:
-                case "catalog":
-                    MetadataRecord._populate_schema(getattr(schema_obj, field), api_data, value)
-                case "dataset":
-                    MetadataRecord._populate_schema(getattr(schema_obj, field), api_data, value)
-                case "distribution":
-                    MetadataRecord._populate_schema(getattr(schema_obj, field), api_data, value)
+                case "catalog" | "dataset" | "distribution":
+                    MetadataRecord._build_mapping_index(getattr(schema_obj, field), value, index)
                 case "mapping":
                     if isinstance(value, dict):
                         for api_field, internal_fields in value.items():
-                            if api_field in api_data:
-                                for internal_field in internal_fields:
-                                    if api_data[api_field]:
-                                        if internal_field == "keyword" and isinstance(schema_obj.keyword, list):
-                                            setattr(schema_obj, internal_field, schema_obj.keyword + api_data[api_field]) # Not using extend here because it changes keyword in config
-                                        else:
-                                            setattr(schema_obj, internal_field, api_data[api_field])
+                            for internal_field in internal_fields:
+                                index.setdefault(api_field, []).append((schema_obj, internal_field))
+        return index
+
+    @staticmethod
+    def _apply_api_data(index: dict, api_data: dict):
+        """Assigns api values to their mapped fields in a single pass over the api data"""
+        pending_keywords = {}
+        for api_field, api_value in api_data.items():
+            if not api_value:
+                continue
+            for target, internal_field in index.get(api_field, ()):
+                if internal_field == "keyword" and isinstance(target.keyword, list):
+                    if not isinstance(api_value, list):
+                        raise TypeError(f"Expected a list for keyword field: {api_field}")
+                    pending_keywords.setdefault(id(target), (target, []))[1].extend(api_value)
+                else:
+                    setattr(target, internal_field, api_value)
+        for target, extension in pending_keywords.values():
+            # Concatenating instead of extending keeps the keyword list in config untouched
+            target.keyword = target.keyword + extension
+
 
+    @staticmethod
+    def _transform_node(schema_obj):
+        """Applies all Health-RI transformations to one node, then recurses into nested models"""
+        for field_name, is_list_type in _field_plan(type(schema_obj)):
+            value = schema_obj.__dict__.get(field_name)
+            value = MetadataRecord._coerce_list(schema_obj, field_name, is_list_type, value)
+            if value:
+                MetadataRecord._convert_enum_field(schema_obj, field_name, value)
+
+            if isinstance(value, BaseModel):
+                MetadataRecord._transform_node(value)
+            elif isinstance(value, list):
+                for v in value:
+                    if isinstance(v, BaseModel):
+                        MetadataRecord._transform_node(v)
+
+            if not MetadataRecord._convert_agent_field(schema_obj, field_name, value):
+                MetadataRecord._convert_kind_field(schema_obj, field_name, value)
 
     @staticmethod
     def _ensure_lists(schema_obj):
         """Changes all fields that need to be lists in the Health-RI metadata schema into lists, and ensures fields that are not allowed to be lists are not"""
-        for field_name, field in schema_obj.model_fields.items():
-            value = getattr(schema_obj, field_name)
+        for field_name, is_list_type in _field_plan(type(schema_obj)):
+            value = schema_obj.__dict__.get(field_name)
             if isinstance(value, BaseModel):
                 MetadataRecord._ensure_lists(value)
-                
-            is_list_type = 'List' in str(field.annotation)
-            if is_list_type and not isinstance(value, list) and value is not None:
-                setattr(schema_obj, field_name, [value])
-            elif not is_list_type and isinstance(value, list):
-                if len(value) == 1:
-                    setattr(schema_obj, field_name, value[0])
-                    warnings.warn(f"Please do not put list in field: {field_name}")
-                else:
-                    raise TypeError(f"Found list where it is not supposed to be: {field_name}")
+
+            MetadataRecord._coerce_list(schema_obj, field_name, is_list_type, value)
+
+    @staticmethod
+    def _coerce_list(schema_obj, field_name, is_list_type, value):
+        """Wraps or unwraps a single field value to match its list annotation and returns the result"""
+        if is_list_type and not isinstance(value, list) and value is not None:
+            value = [value]
+            schema_obj.__dict__[field_name] = value
+        elif not is_list_type and isinstance(value, list):
+            if len(value) == 1:
+                value = value[0]
+                schema_obj.__dict__[field_name] = value
+                warnings.warn(f"Please do not put list in field: {field_name}")
+            else:
+                raise TypeError(f"Found list where it is not supposed to be: {field_name}")
+        return value
 
 
     @staticmethod
     def _string_to_enum(schema_obj):
         """Changes field values into Health-RI supported categories"""
-        for field_name, _ in schema_obj.model_fields.items():
-            value = getattr(schema_obj, field_name)
+        for field_name, _ in _field_plan(type(schema_obj)):
+            value = schema_obj.__dict__.get(field_name)
             if value:
                 if isinstance(value, BaseModel):
                     MetadataRecord._string_to_enum(value)
@@ -157,57 +241,31 @@ class MetadataRecord(BaseModel):
                         if isinstance(v, BaseModel):
                             MetadataRecord._string_to_enum(v)
 
-                dict_backed = {
-                    "access_rights": access_rights,
-                    "theme": themes,
-                    "license": licenses,
-                    "status": statuses,
-                    "frequency": frequencies,
-                }
-                transformer_backed = ["format", "language", "legal_basis", "personal_data", "purpose"]
-
-                if field_name in dict_backed:
-                    kind = dict_backed[field_name]
-                    if isinstance(value, list):
-                        for i, v in enumerate(value):
-                            value[i] = MetadataRecord._to_enum(v, kind)
-                    else:
-                        setattr(schema_obj, field_name, MetadataRecord._to_enum(value, kind))
-
-                elif field_name in transformer_backed:
-                    if isinstance(value, list):
-                        for i, v in enumerate(value):
-                            value[i] = MetadataRecord._to_enum(v, field_name)
-                    else:
-                        setattr(schema_obj, field_name, MetadataRecord._to_enum(value, field_name))
-
-                elif field_name == "spatial":
-                    pass
+                MetadataRecord._convert_enum_field(schema_obj, field_name, value)
 
-                else:
-                    pass
+    @staticmethod
+    def _convert_enum_field(schema_obj, field_name, value):
+        """Converts a single field's value(s) into Health-RI supported categories"""
+        handler = _ENUM_HANDLERS.get(field_name)
+        if handler is None:
+            return
+        if isinstance(value, list):
+            for i, v in enumerate(value):
+                value[i] = handler(v)
+        else:
+            schema_obj.__dict__[field_name] = handler(value)
 
 
     @staticmethod
     def _to_enum(value, kind):
-        match kind:
-            case "format":
-                return MetadataRecord._format_transformation(value)
-            case "language":
-                return MetadataRecord._language_transformation(value)
-            case "legal_basis":
-                return MetadataRecord._legal_basis_transformation(value)
-            case "personal_data":
-                return MetadataRecord._personal_data_transformation(value)
-            case "purpose":
-                return MetadataRecord._purpose_transformation(value)
-            case _:
-                try:
-                    return kind[value.lower()]
-                except:
-                    if not value in kind.values():
-                        raise ValueError(f"{value} incorrect or not supported. Supported values: {', '.join(kind.keys())}")
-        
+        if isinstance(value, str):
+            key = value if value.islower() else value.lower()
+            hit = kind.get(key, _MISSING)
+            if hit is not _MISSING:
+                return hit
+        if not value in kind.values():
+            raise ValueError(f"{value} incorrect or not supported. Supported values: {', '.join(kind.keys())}")
+
 
     @staticmethod
     def _format_transformation(value):
@@ -261,65 +319,64 @@ class MetadataRecord(BaseModel):
     @staticmethod
     def _agent_to_HRIAgent(schema_obj):
         """Changes Agents into Health-RI Agents"""
-        for field_name, _ in schema_obj.model_fields.items():
-            value = getattr(schema_obj, field_name)
-            if isinstance(value, Agent):
-                setattr(schema_obj, field_name, MetadataRecord._create_HRIAgent(value)) 
-                
-            elif isinstance(value, list) and any(isinstance(v, Agent) for v in value):
-                new_agents = []
-                for agent in value:
-                    if isinstance(agent, Agent):
-                        new_agents.append(MetadataRecord._create_HRIAgent(agent))
-                    elif isinstance(agent, HRIAgent):
-                        new_agents.append(agent)
-                    else:
-                        raise ValueError("Encountered not Agent or HRIAgent in list")
-                setattr(schema_obj, field_name, new_agents)
-
+        for field_name, _ in _field_plan(type(schema_obj)):
+            value = schema_obj.__dict__.get(field_name)
+            if MetadataRecord._convert_agent_field(schema_obj, field_name, value):
+                pass
             elif isinstance(value, BaseModel):
-                MetadataRecord._agent_to_HRIAgent(value)    
+                MetadataRecord._agent_to_HRIAgent(value)
             elif isinstance(value, list):
                 for v in value:
                     if isinstance(v, BaseModel):
                         MetadataRecord._agent_to_HRIAgent(v)
 
+    @staticmethod
+    def _convert_agent_field(schema_obj, field_name, value) -> bool:
+        """Converts an Agent or list containing Agents to HRIAgents, returns whether it did"""
+        if isinstance(value, Agent):
+            schema_obj.__dict__[field_name] = MetadataRecord._create_HRIAgent(value)
+            return True
+
+        if isinstance(value, list):
+            new_agents = None
+            invalid = False
+            for i, agent in enumerate(value):
+                if isinstance(agent, Agent):
+                    if new_agents is None:
+                        new_agents = list(value)
+                    new_agents[i] = MetadataRecord._create_HRIAgent(agent)
+                elif not isinstance(agent, HRIAgent):
+                    invalid = True
+            if new_agents is not None:
+                if invalid:
+                    raise ValueError("Encountered not Agent or HRIAgent in list")
+                schema_obj.__dict__[field_name] = new_agents
+                return True
+
+        return False
+
     @staticmethod
     def _create_HRIAgent(agent: Agent) -> HRIAgent:
+        values = agent.__dict__
         kwargs = {
-            'mbox': agent.mbox,
-            'identifier': agent.identifier,
-            'name': agent.name,
-            'homepage': agent.homepage
+            'mbox': values['mbox'],
+            'identifier': values['identifier'],
+            'name': values['name'],
+            'homepage': values['homepage']
         }
-        if agent.spatial is not None:
-            kwargs['spatial'] = agent.spatial
-        if agent.type is not None:
-            kwargs['type'] = agent.type
-        if agent.publisher_type is not None:
-            kwargs['publisher_type'] = agent.publisher_type
-        if agent.publisher_note is not None:
-            kwargs['publisher_note'] = agent.publisher_note
+        for key in ('spatial', 'type', 'publisher_type', 'publisher_note'):
+            value = values.get(key)
+            if value is not None:
+                kwargs[key] = value
         return HRIAgent(**kwargs)
 
     @staticmethod
     def _kind_to_HRIVCard(schema_obj):
         """Changes kinds into Health-RI VCards"""
-        for field_name, _ in schema_obj.model_fields.items():
-            value = getattr(schema_obj, field_name)
-            if isinstance(value, Kind):
-                setattr(schema_obj, field_name, MetadataRecord._create_HRIVCard(value))
-            elif isinstance(value, list) and any(isinstance(v, Kind) for v in value):
-                new_card = []
-                for kind in value:
-                    if isinstance(kind, Kind):
-                        new_card.append(MetadataRecord._create_HRIVCard(kind))
-                    elif isinstance(kind, HRIVCard):
-                        new_card.append(kind)
-                    else:
-                        raise ValueError("Encountered not Kind or VCard in list")
-                setattr(schema_obj, field_name, new_card)
-
+        for field_name, _ in _field_plan(type(schema_obj)):
+            value = schema_obj.__dict__.get(field_name)
+            if MetadataRecord._convert_kind_field(schema_obj, field_name, value):
+                pass
             elif isinstance(value, BaseModel):
                 MetadataRecord._kind_to_HRIVCard(value)
 
@@ -328,18 +385,64 @@ class MetadataRecord(BaseModel):
                     if isinstance(v, BaseModel):
                         MetadataRecord._kind_to_HRIVCard(v)
 
+    @staticmethod
+    def _convert_kind_field(schema_obj, field_name, value) -> bool:
+        """Converts a Kind or list containing Kinds to HRIVCards, returns whether it did"""
+        if isinstance(value, Kind):
+            schema_obj.__dict__[field_name] = MetadataRecord._create_HRIVCard(value)
+            return True
+
+        if isinstance(value, list):
+            new_card = None
+            invalid = False
+            for i, kind in enumerate(value):
+                if isinstance(kind, Kind):
+                    if new_card is None:
+                        new_card = list(value)
+                    new_card[i] = MetadataRecord._create_HRIVCard(kind)
+                elif not isinstance(kind, HRIVCard):
+                    invalid = True
+            if new_card is not None:
+                if invalid:
+                    raise ValueError("Encountered not Kind or VCard in list")
+                schema_obj.__dict__[field_name] = new_card
+                return True
+
+        return False
+
     @staticmethod
     def _create_HRIVCard(kind: Kind) -> HRIVCard:
+        values = kind.__dict__
         kwargs = {
-            'hasEmail': kind.hasEmail,
-            'formatted_name': kind.fn
+            'hasEmail': values['hasEmail'],
+            'formatted_name': values['fn']
         }
-        if kind.hasUrl is not None:
-            kwargs['contact_page'] = kind.hasUrl
+        if values.get('hasUrl') is not None:
+            kwargs['contact_page'] = values['hasUrl']
         return HRIVCard(**kwargs)
 
+    @staticmethod
+    def _restore_required(data, dumped: dict):
+        """Checks mandatory fields and re-inserts ones that model_dump(exclude_none=True) removed"""
+        for name, field in type(data).model_fields.items():
+            if name not in data.__dict__:
+                raise ValueError("Likely put null or null equivalent value in required field")
+            value = data.__dict__[name]
+            if value is None:
+                if field.is_required():
+                    dumped[name] = None
+                continue
+            sub = dumped.get(name)
+            if isinstance(value, BaseModel) and isinstance(sub, dict):
+                MetadataRecord._restore_required(value, sub)
+            elif isinstance(value, list) and isinstance(sub, list):
+                for v, s in zip(value, sub):
+                    if isinstance(v, BaseModel) and isinstance(s, dict):
+                        MetadataRecord._restore_required(v, s)
+
     # The _drop_none function below is necessary because when validating an HRIVCard or HRIAgent which has
-    # optional values that are None, it gives a ValidationError
+    # optional values that are None, it gives a ValidationError. It is kept as a fallback for objects
+    # that pydantic-core cannot serialize.
     @staticmethod
     def _drop_none(data):
         """Removes all None values in non mandatory fields"""
@@ -359,4 +462,22 @@ class MetadataRecord(BaseModel):
         elif isinstance(data, list):
             return [MetadataRecord._drop_none(v) for v in data if v is not None]
         else:
-            return data
\ No newline at end of file
+            return data
+
+# Built after the class body because the handlers are MetadataRecord staticmethods.
+# Keys are interned so the dict probes in _convert_enum_field compare by pointer.
+_ENUM_HANDLERS = {
+    sys.intern(field_name): handler
+    for field_name, handler in {
+        "access_rights": functools.partial(MetadataRecord._to_enum, kind=access_rights),
+        "theme": functools.partial(MetadataRecord._to_enum, kind=themes),
+        "license": functools.partial(MetadataRecord._to_enum, kind=licenses),
+        "status": functools.partial(MetadataRecord._to_enum, kind=statuses),
+        "frequency": functools.partial(MetadataRecord._to_enum, kind=frequencies),
+        "format": MetadataRecord._format_transformation,
+        "language": MetadataRecord._language_transformation,
+        "legal_basis": MetadataRecord._legal_basis_transformation,
+        "personal_data": MetadataRecord._personal_data_transformation,
+        "purpose": MetadataRecord._purpose_transformation,
+    }.items()
+}
\ No newline at end of file
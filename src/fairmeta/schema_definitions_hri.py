@@ -1,6 +1,8 @@
 from __future__ import annotations
 from datetime import date, datetime
-from pydantic import BaseModel, AnyHttpUrl, AnyUrl, AwareDatetime, NaiveDatetime
+from pydantic.main import BaseModel
+from pydantic.networks import AnyHttpUrl, AnyUrl
+from pydantic.types import AwareDatetime, NaiveDatetime
 from sempyro.dcat import AccessRights
 from sempyro.geo import Location
 from sempyro.hri_dcat import HRIVCard, HRIAgent, DatasetTheme, DatasetStatus, DistributionStatus
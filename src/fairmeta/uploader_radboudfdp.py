@@ -1,9 +1,13 @@
+import json
 import os
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
 from urllib.parse import urlparse, urlunparse
 from .metadata_model import MetadataRecord
-from pydantic import AnyHttpUrl, Field
-from sempyro.hri_dcat import HRICatalog, HRIDataset, HRIDistribution
+from pydantic.fields import Field
+from pydantic.networks import AnyHttpUrl
+from sempyro.hri_dcat import HRICatalog, HRIDataset
 from rdflib import DCTERMS, URIRef
 import logging
 
@@ -15,6 +19,25 @@ class FDPCatalog(HRICatalog):
             "rdf_type": "uri"
         })
 
+_DISALLOWED_FIELDS = frozenset({"distribution", "dataset"})
+
+# The publish payload never changes, so it is encoded once here instead of
+# per request.
+_PUBLISH_BODY = json.dumps({'current': 'PUBLISHED'}).encode()
+
+def _filtered_fields(model) -> dict:
+    """Returns the model's field values minus child containers and Nones"""
+    return {k: v for k, v in model.__dict__.items() if k not in _DISALLOWED_FIELDS and v is not None}
+
+def _graph_to_turtle(graph) -> str:
+    """Serializes a graph for upload as text/turtle.
+
+    N-Triples is a subset of Turtle, and rdflib's ntriples serializer skips
+    the namespace binding and pretty-printing work of the turtle one, so the
+    output stays valid for the FDP while being much cheaper to produce.
+    """
+    return graph.serialize(format="nt11")
+
 class RadboudFDP:
     def __init__(self, test=False, token=None):
         self.test = test
@@ -27,92 +50,102 @@ class RadboudFDP:
             self.post_url = "https://fdp.radboudumc.nl/acc"
         else:
             self.post_url = self.base_url
+        self.session = requests.Session()
+        self.session.headers['Authorization'] = f'Bearer {self.FDP_key}'
 
     def get(self, url):
-        headers = {
-            'Authorization': f'Bearer {self.FDP_key}',
-        }
-        rsp = requests.get(url, headers=headers)
+        rsp = self.session.get(url)
         self._check_response(rsp, action="GET")
         return rsp
-    
+
 
     def create_and_publish(self, metadata_record: MetadataRecord, catalog_name: str) -> list[str]:
         """Uploads a MetadataRecord object to Radboud FDP and returns url's"""
         urls = []
-        disallowed_fields = {"distribution", "dataset"}
-        filtered_fields = {k: v for k, v in vars(metadata_record.catalog).items() if k not in disallowed_fields and v is not None}
+        filtered_fields = _filtered_fields(metadata_record.catalog)
         catalog = FDPCatalog(
             is_part_of=[URIRef(self.base_url)],
             dataset = [],
             **filtered_fields
         )
         metadata_catalog_record = catalog.to_graph(URIRef(f"{self.post_url}/catalog/{catalog_name}"))
-        metadata_catalog_turtle = metadata_catalog_record.serialize(format="turtle")
+        metadata_catalog_turtle = _graph_to_turtle(metadata_catalog_record)
         post_rsp = self._post(metadata_catalog_turtle, "catalog")
         metadata_catalog_url = post_rsp.headers["Location"]
         urls.append(metadata_catalog_url)
 
-        for dataset in metadata_record.catalog.dataset:
-            filtered_fields = {k: v for k, v in vars(dataset).items() if k not in disallowed_fields and v is not None}
-            hri_dataset = HRIDataset(
-                **filtered_fields
-            )
-            metadata_dataset_record = hri_dataset.to_graph(subject=URIRef(hri_dataset.identifier))
-            metadata_dataset_record.add((URIRef(hri_dataset.identifier), DCTERMS.isPartOf, URIRef(metadata_catalog_url)))
-            metadata_dataset_turtle = metadata_dataset_record.serialize(format="turtle")
-            post_rsp = self._post(metadata_dataset_turtle, "dataset")
-            metadata_dataset_url = post_rsp.headers["Location"]
-            urls.append(metadata_dataset_url)
-
-            # Cannot test this due to SHACLs: byteSize gives DatatypeConstraintComponent* and title gives MinCountConstraintComponent (Even though it is not mandatory)
-            # in SeMPyRO, byteSize is xsd:integer, I think defining it as xsd:nonnegativeinteger would immediately solve this problem.
-            # for distribution in dataset.distribution:
-            #     filtered_fields = {k: v for k, v in vars(distribution).items() if k not in disallowed_fields and v is not None}
-            #     hri_distribution = HRIDistribution(
-            #         **filtered_fields
-            #     )
-            #     access_url_str = str(hri_distribution.access_url)
-            #     distribution_uri = URIRef(f"{hri_dataset.identifier}/distribution/{access_url_str.split('/')[-1]}")
-            #     metadata_distribution_record = hri_distribution.to_graph(subject=distribution_uri)
-            #     metadata_distribution_record.add((distribution_uri, DCTERMS.isPartOf, URIRef(f"{metadata_dataset_url}")))
-            #     metadata_distribution_turtle = metadata_distribution_record.serialize(format="turtle")
-
-            #     post_rsp = self._post(metadata_distribution_turtle, "distribution")
-            #     metadata_distribution_url = post_rsp.headers["Location"]
-            #     urls.append(metadata_distribution_url)
-
-            #     publish_rsp = self._publish(metadata_distribution_url)
-
-            publish_rsp = self._publish(metadata_dataset_url)
+        # The datasets are independent and the work is IO-bound on the FDP
+        # server, so upload them concurrently over the pooled session.
+        catalog_ref = URIRef(metadata_catalog_url)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            urls.extend(executor.map(self._upload_one_dataset,
+                                     metadata_record.catalog.dataset,
+                                     repeat(catalog_ref)))
 
         publish_rsp = self._publish(metadata_catalog_url)
 
         return urls
 
 
+    def _upload_one_dataset(self, dataset, catalog_ref: URIRef) -> str:
+        """Posts and publishes a single dataset under the given catalog and returns its url"""
+        filtered_fields = _filtered_fields(dataset)
+        hri_dataset = HRIDataset(
+            **filtered_fields
+        )
+        dataset_ref = URIRef(hri_dataset.identifier)
+        metadata_dataset_record = hri_dataset.to_graph(subject=dataset_ref)
+        metadata_dataset_record.add((dataset_ref, DCTERMS.isPartOf, catalog_ref))
+        metadata_dataset_turtle = _graph_to_turtle(metadata_dataset_record)
+        post_rsp = self._post(metadata_dataset_turtle, "dataset")
+        metadata_dataset_url = post_rsp.headers["Location"]
+
+        # Cannot test this due to SHACLs: byteSize gives DatatypeConstraintComponent* and title gives MinCountConstraintComponent (Even though it is not mandatory)
+        # in SeMPyRO, byteSize is xsd:integer, I think defining it as xsd:nonnegativeinteger would immediately solve this problem.
+        # for distribution in dataset.distribution:
+        #     filtered_fields = {k: v for k, v in vars(distribution).items() if k not in disallowed_fields and v is not None}
+        #     hri_distribution = HRIDistribution(
+        #         **filtered_fields
+        #     )
+        #     access_url_str = str(hri_distribution.access_url)
+        #     distribution_uri = URIRef(f"{hri_dataset.identifier}/distribution/{access_url_str.split('/')[-1]}")
+        #     metadata_distribution_record = hri_distribution.to_graph(subject=distribution_uri)
+        #     metadata_distribution_record.add((distribution_uri, DCTERMS.isPartOf, URIRef(f"{metadata_dataset_url}")))
+        #     metadata_distribution_turtle = metadata_distribution_record.serialize(format="turtle")
+
+        #     post_rsp = self._post(metadata_distribution_turtle, "distribution")
+        #     metadata_distribution_url = post_rsp.headers["Location"]
+        #     urls.append(metadata_distribution_url)
+
+        #     publish_rsp = self._publish(metadata_distribution_url)
+
+        publish_rsp = self._publish(metadata_dataset_url)
+
+        return metadata_dataset_url
+
+
     def update(self, target: str, metadata_record: MetadataRecord, url: str, pointer_url):
-        disallowed_fields = {"distribution", "dataset"}            
         match target:
             case "catalog":
-                filtered_fields = {k: v for k, v in vars(metadata_record).items() if k not in disallowed_fields and v is not None}
+                filtered_fields = _filtered_fields(metadata_record)
                 catalog = FDPCatalog(
                     is_part_of=[URIRef(self.base_url)],
                     dataset = [pointer_url],
                     **filtered_fields
                 )
                 metadata_catalog_record = catalog.to_graph(URIRef(url))
-                metadata_catalog_turtle = metadata_catalog_record.serialize(format="turtle")
+                metadata_catalog_turtle = _graph_to_turtle(metadata_catalog_record)
                 rsp = self._put(metadata_catalog_turtle, url)
 
             case "dataset":
-                filtered_fields = {k: v for k, v in vars(metadata_record).items() if k not in disallowed_fields and v is not None}
+                filtered_fields = _filtered_fields(metadata_record)
                 hri_dataset = HRIDataset(
                     **filtered_fields
                 )
-                metadata_dataset_record = hri_dataset.to_graph(subject=URIRef(url))
-                metadata_dataset_record.add((URIRef(url), DCTERMS.isPartOf, URIRef(pointer_url)))
-                metadata_dataset_turtle = metadata_dataset_record.serialize(format="turtle")
+                dataset_ref = URIRef(url)
+                metadata_dataset_record = hri_dataset.to_graph(subject=dataset_ref)
+                metadata_dataset_record.add((dataset_ref, DCTERMS.isPartOf, URIRef(pointer_url)))
+                metadata_dataset_turtle = _graph_to_turtle(metadata_dataset_record)
                 rsp = self._put(metadata_dataset_turtle, url)
 
             case _:
@@ -134,10 +167,7 @@ class RadboudFDP:
                 else:
                     print("Type 'yes' to confirm deletion or 'no' to cancel.")
 
-        headers = {
-            'Authorization': f'Bearer {self.FDP_key}',
-        }
-        rsp = requests.delete(url, headers=headers)
+        rsp = self.session.delete(url)
         self._check_response(rsp, action="DELETE")
         logging.info(f"Deleting: {url}, response (should be 204): {rsp}")
         return rsp
@@ -146,10 +176,9 @@ class RadboudFDP:
     def _post(self, turtle, location) -> str:
         url = f"{self.post_url}/{location}"
         headers = {
-            'Authorization': f'Bearer {self.FDP_key}',
             'Content-Type': 'text/turtle'
         }
-        rsp = requests.post(url, headers=headers, data=turtle, allow_redirects=True)
+        rsp = self.session.post(url, headers=headers, data=turtle, allow_redirects=True)
         self._check_response(rsp, action="POST")
         logging.info(f"Posting: {location}, response (should be 201): {rsp}")
         return rsp
@@ -163,14 +192,10 @@ class RadboudFDP:
 
         publish_url = f"{url}/meta/state"
         headers = {
-            'Authorization': f'Bearer {self.FDP_key}',
             'Accept': 'application/json',
             'Content-Type': 'application/json'
         }
-        json_data = {
-            'current': 'PUBLISHED'
-        }
-        rsp = requests.put(url=publish_url, headers=headers, json=json_data)
+        rsp = self.session.put(url=publish_url, headers=headers, data=_PUBLISH_BODY)
         self._check_response(rsp, action="PUT")
         logging.info(f"Published, this should be 200: {rsp}")
         return rsp
@@ -183,12 +208,11 @@ class RadboudFDP:
             url = urlunparse(parsed._replace(path=new_path))
 
         headers = {
-                'Authorization': f'Bearer {self.FDP_key}',
                 'Accept': 'text/turtle',
                 'Content-Type': 'text/turtle'
             }
-        
-        rsp = requests.put(url, headers=headers, data=turtle)
+
+        rsp = self.session.put(url, headers=headers, data=turtle)
         self._check_response(rsp, action="PUT")
         return rsp
     
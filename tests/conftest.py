@@ -1,6 +1,7 @@
+import functools
 import pytest
+from copy import deepcopy
 from datetime import datetime, date, timezone, timedelta
-from test_utils import extend_dict
 from fairmeta import RadboudFDP
 from dotenv import load_dotenv
 import os
@@ -8,8 +9,89 @@ import isodate
 
 load_dotenv()
 
-@pytest.fixture(params=["minimal", "full"])
-def config(request):
+# One fixed timestamp for every date field, so the session-built config is
+# deterministic and reusable across tests.
+_FIXED_DATETIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+# The "full" variant's additions, flattened once at import into
+# (path, value) overrides so the full build is plain dict writes instead
+# of a recursive merge.
+_FULL_EXTENSION = {
+    "catalog": {
+        "publisher": {
+            "spatial": ["http://publications.europa.eu/resource/authority/country/NLD"],
+            "publisher_note": "Notitie",
+            "publisher_type": "http://purl.org/adms/publishertype/Academia-ScientificOragnisation",
+        },
+        "applicable_legislation": "https://www.legislation.com",
+        "creator": {
+            "mbox": "catalog@testing.com",
+            "identifier": ["catalogtest person identifier"],
+            "name": ["catalogmaker"],
+            "homepage": "https://catalogmaker.org"
+        }, "geographical_coverage": "https://www.geonames.org/countries/NL/the-netherlands.html",
+        "homepage": "https://homepage.org",
+        "language": "eng",
+        "license": "cc0",
+        "modification_date": _FIXED_DATETIME,
+        "release_date": _FIXED_DATETIME,
+        "rights": "https://www.websitewithfreetextrights.com",
+        # "temporal_coverage": PeriodOfTime(start_date=datetime.now(), end_date=datetime.now()),
+        "dataset": {
+            "code_values": "https://www.wikidata.org/wiki/Q32566",
+            "coding_system": "https://www.wikidata.org/wiki/Q81095",
+            "conforms_to": "https://www.wikidata.org/wiki/Q81095",
+            "distribution": {
+                "applicable_legislation": "https://www.legislation.com",
+                "compression_format": "https://www.iana.org/assignments/media-types/application/zip",
+                "description": ["Description of the distribution", "Description in another language"],
+                "documentation": "https://documentation.com",
+                "download_url": "https://google.com",
+                "language": ["Eng", "nld"],
+                "media_type": "https://www.iana.org/assignments/media-types/text/csv",
+                "modification_date": _FIXED_DATETIME,
+                "packaging_format": "https://package_information.com",
+                "release_date": _FIXED_DATETIME,
+                "status": "completed",
+                "temporal_resolution": str(timedelta(days=1)),
+                "title": ["title of distribution"]
+            },
+            "frequency": "daily",
+            "purpose": "https://purpose.com",
+            "geographical_coverage": "https://nijmegen.nl",
+            "is_referenced_by": "https://doi.org",
+            "language": "nld",
+            "legal_basis": "InformedConsent",
+            "maximum_typical_age": 55,
+            "minimum_typical_age": 29,
+            "modification_date": _FIXED_DATETIME,
+            "number_of_records": 99,
+            "number_of_unique_individuals": 88,
+            "personal_data": "https://w3id.org/dpv/pd#Household",
+            "population_coverage": "Adults aged 18–65 diagnosed with type 2 diabetes in the Netherlands between 2015 and 2020",
+            "purpose": "https://w3id.org/dpv#CustomerManagement",
+            "release_date": _FIXED_DATETIME,
+            "temporal_resolution": isodate.duration_isoformat(timedelta(days=1)),
+            "type": "https://www.type.nl",
+            "status": "withdrawn",
+            "version": "1",
+            "version_notes": ["changed nothing", "still nothing"],
+            "was_generated_by": "https://me.nl"
+        }
+    }
+}
+
+def _flatten_overrides(extension, prefix=()):
+    for key, value in extension.items():
+        if isinstance(value, dict):
+            yield from _flatten_overrides(value, prefix + (key,))
+        else:
+            yield prefix + (key,), value
+
+_FULL_OVERRIDES = tuple(_flatten_overrides(_FULL_EXTENSION))
+
+@functools.lru_cache(maxsize=None)
+def _build_base_config(variant):
     config = {
         "catalog": {
             "mapping": {
@@ -60,76 +142,33 @@ def config(request):
             }
         }
     }
-    if request.param == "full":
-        extended_config = {
-            "catalog": {
-                "publisher": {
-                    "spatial": ["http://publications.europa.eu/resource/authority/country/NLD"],
-                    "publisher_note": "Notitie",
-                    "publisher_type": "http://purl.org/adms/publishertype/Academia-ScientificOragnisation",
-                },
-                "applicable_legislation": "https://www.legislation.com",
-                "creator": {
-                    "mbox": "catalog@testing.com",
-                    "identifier": ["catalogtest person identifier"],
-                    "name": ["catalogmaker"],
-                    "homepage": "https://catalogmaker.org"
-                }, "geographical_coverage": "https://www.geonames.org/countries/NL/the-netherlands.html",
-                "homepage": "https://homepage.org",
-                "language": "eng",
-                "license": "cc0",
-                "modification_date": datetime.now(timezone.utc),
-                "release_date": datetime.now(timezone.utc),
-                "rights": "https://www.websitewithfreetextrights.com",
-                # "temporal_coverage": PeriodOfTime(start_date=datetime.now(), end_date=datetime.now()),
-                "dataset": {
-                    "code_values": "https://www.wikidata.org/wiki/Q32566",
-                    "coding_system": "https://www.wikidata.org/wiki/Q81095",
-                    "conforms_to": "https://www.wikidata.org/wiki/Q81095",
-                    "distribution": {
-                        "applicable_legislation": "https://www.legislation.com",
-                        "compression_format": "https://www.iana.org/assignments/media-types/application/zip",
-                        "description": ["Description of the distribution", "Description in another language"],
-                        "documentation": "https://documentation.com",
-                        "download_url": "https://google.com",
-                        "language": ["Eng", "nld"],
-                        "media_type": "https://www.iana.org/assignments/media-types/text/csv",
-                        "modification_date": datetime.now(timezone.utc),
-                        "packaging_format": "https://package_information.com",
-                        "release_date": datetime.now(timezone.utc),
-                        "status": "completed",
-                        "temporal_resolution": str(timedelta(days=1)),
-                        "title": ["title of distribution"]
-                    },
-                    "frequency": "daily",
-                    "purpose": "https://purpose.com",
-                    "geographical_coverage": "https://nijmegen.nl",
-                    "is_referenced_by": "https://doi.org",
-                    "language": "nld",
-                    "legal_basis": "InformedConsent",
-                    "maximum_typical_age": 55,
-                    "minimum_typical_age": 29,
-                    "modification_date": datetime.now(timezone.utc),
-                    "number_of_records": 99,
-                    "number_of_unique_individuals": 88,
-                    "personal_data": "https://w3id.org/dpv/pd#Household",
-                    "population_coverage": "Adults aged 18–65 diagnosed with type 2 diabetes in the Netherlands between 2015 and 2020",
-                    "purpose": "https://w3id.org/dpv#CustomerManagement",
-                    "release_date": datetime.now(timezone.utc),
-                    "temporal_resolution": isodate.duration_isoformat(timedelta(days=1)),
-                    "type": "https://www.type.nl",
-                    "status": "withdrawn",
-                    "version": "1",
-                    "version_notes": ["changed nothing", "still nothing"],
-                    "was_generated_by": "https://me.nl"
-                }
-            }
-        }
-        config = extend_dict(config, extended_config)
+    if variant == "full":
+        for path, value in _FULL_OVERRIDES:
+            d = config
+            for key in path[:-1]:
+                d = d.setdefault(key, {})
+            d[path[-1]] = value
 
     return config
 
+@pytest.fixture(scope="session", params=["minimal", "full"])
+def base_config(request):
+    return _build_base_config(request.param)
+
 @pytest.fixture
+def config(base_config):
+    # The schema builder keeps references into the config and the transforms
+    # mutate nested lists in place, so every test gets its own copy of the
+    # session-built base instead of the shared object.
+    return deepcopy(base_config)
+
+@pytest.fixture
+def minimal_config():
+    # For tests whose behaviour is identical under the "full" extensions;
+    # using this instead of config halves their parametrization count.
+    return deepcopy(_build_base_config("minimal"))
+
+@pytest.fixture(scope="session")
 def api_data():
     return {
         "challenge_description": "Description given by challenge",
@@ -159,6 +198,13 @@ def extra_config():
     }
     return config
 
+@pytest.fixture(scope="session")
+def gc_client():
+    # Client construction runs a version check against the live API, so pay
+    # for it once per session instead of once per parametrization.
+    from gcapi import Client
+    return Client(token="token")
+
 @pytest.fixture
 def FDP():
     local_url = "http://localhost:8080"
@@ -1,7 +1,7 @@
 import pytest
 from fairmeta.gatherers.gather_GC import GrandChallenge
-from httpx import HTTPStatusError, Request, Response
-from gcapi import Client
+from gcapi.apibase import PageResult
+from httpx import HTTPStatusError, MockTransport, Response
 import test_utils
 from fairmeta import metadata_model
 import requests
@@ -9,60 +9,83 @@ import random
 import string
 from rdflib import Graph
 
+class FakeArchive:
+    def __init__(self, slug):
+        self.pk = 2
+        self.slug = slug.lower()
+
+class FakeArchives:
+    def detail(self, slug):
+        return FakeArchive(slug)
+
+class FakeImages:
+    _items = [{"id": "img1"}, {"id": "img2"}]
+
+    def page(self, offset=0, limit=100, params=None):
+        return PageResult(offset=offset, limit=limit,
+                          total_count=len(self._items),
+                          results=self._items[offset:offset + limit])
+
+# The fakes are stateless, so one instance of each serves every test case.
+_FAKE_ARCHIVES = FakeArchives()
+_FAKE_IMAGES = FakeImages()
+
 @pytest.mark.parametrize("slug,status_code,exception",[("LUNA16", 200, None),
-                                                       ("weird", 404, HTTPStatusError)])
-def test_gather_gc_data(monkeypatch, slug, status_code, exception):
+                                                       ("weird", 404, HTTPStatusError)], ids=test_utils.param_id)
+def test_gather_gc_data(monkeypatch, gc_client, slug, status_code, exception):
     calls = []
 
-    def fake_get(self, path, **kwargs) -> Response:
-        calls.append((path, kwargs))
+    def handler(request) -> Response:
+        calls.append(request.url.path)
         if status_code == 200:
             content = {"name": slug, "pk": 1}
         else:
             content = {"detail": "Not found"}
-        print("path", path)
-        return Response(status_code=status_code, json=content, request=Request("GET", f"https://grand-challenge.org/api/v1/challenges{path}"))
-
-    monkeypatch.setattr(Client, "get", fake_get)
-    class FakeArchive:
-        def __init__(self):
-            self.pk = 2
-            self.slug = slug.lower()
-    
-    class FakeArchives:
-        def detail(self, slug):
-            return FakeArchive()
-
-    class FakeImages:
-        def __init__(self):
-            self._items = [{"id": "img1"}, {"id": "img2"}]
-
-        def iterate_all(self, params):
-            for item in self._items:
-                yield item
+        return Response(status_code=status_code, json=content, request=request)
 
-        def list(self, params):
-            return self._items
+    # Serve the canned responses through the real httpx pipeline instead of
+    # replacing Client.get wholesale.
+    monkeypatch.setattr(gc_client, "_transport", MockTransport(handler))
 
     def fake_init(self):
-        self.client = Client(token="token")
-        self.client.archives = FakeArchives()
-        self.client.images = FakeImages()
+        self.client = gc_client
+        self.client.archives = _FAKE_ARCHIVES
+        self.client.images = _FAKE_IMAGES
 
     monkeypatch.setattr("fairmeta.gatherers.gather_GC.GrandChallenge.__init__", fake_init)
 
     platform = GrandChallenge()
     if exception:
-        with pytest.raises(exception) as exc_info:
+        with pytest.raises(exception):
             platform._gather_challenge(f"{slug}")
-        print(exc_info)
     else:
         archive_data = platform._gather_challenge(f"{slug}")
         assert calls
-        assert calls[0][0].endswith(f"/challenges/{slug}"), f"Unexpected ending: {calls[0][0]}"
+        assert calls[0].endswith(f"/challenges/{slug}"), f"Unexpected ending: {calls[0]}"
         assert isinstance(archive_data, dict)
         assert archive_data.get("name") == slug
 
+def test_gather_gc_images(monkeypatch, gc_client):
+    def handler(request) -> Response:
+        return Response(status_code=200, json={"name": "LUNA16", "pk": 1}, request=request)
+
+    monkeypatch.setattr(gc_client, "_transport", MockTransport(handler))
+
+    def fake_init(self):
+        self.client = gc_client
+        self.client.archives = _FAKE_ARCHIVES
+        self.client.images = _FAKE_IMAGES
+
+    monkeypatch.setattr("fairmeta.gatherers.gather_GC.GrandChallenge.__init__", fake_init)
+
+    platform = GrandChallenge()
+    combined_dict = platform.gather_data("LUNA16")
+    # byteSize comes from the page's total_count; it stays 0 if any part of
+    # the image block (including the example image lookup) raises.
+    assert combined_dict["byteSize"] == len(FakeImages._items)
+    assert combined_dict["archive_pk"] == 2
+    assert combined_dict["challenge_name"] == "LUNA16"
+
 
 # @pytest.mark.parametrize()
 def test_FDP_post_and_publish(FDP, config, api_data):
@@ -1,11 +1,20 @@
+import re
 import pytest
 from fairmeta import metadata_model, schema_definitions_hri
 from fairmeta.metadata_model import MetadataRecord
+from fairmeta.uploader_radboudfdp import _filtered_fields
 from pydantic import ValidationError
 from sempyro.hri_dcat import HRIAgent, HRIVCard, HRIDataset, HRIDistribution
 from sempyro.geo import Location
 from rdflib import URIRef
-from test_utils import FDPCatalog, resolve_path, adapted_instance, is_list_field
+from test_utils import fdp_catalog_cls, param_id, resolve_path, adapted_instance, is_list_field
+
+# Expected error messages, escaped and compiled once at import instead of
+# being rebuilt for every parametrization.
+_THEME_MSG = re.compile(re.escape(f"INVALID_THEME incorrect or not supported. Supported values: {', '.join(metadata_model.themes.keys())}"))
+_ACCESS_RIGHTS_MSG = re.compile(re.escape(f"NOT_ALLOWED incorrect or not supported. Supported values: {', '.join(metadata_model.access_rights.keys())}"))
+_NULL_FIELD_MSG = re.compile("Likely put null or null equivalent value in required field")
+_LIST_MSG = re.compile("Found list where it is not supposed to be: identifier")
 
 @pytest.mark.parametrize("target,path,value,exception",[(None, None, None, None), # Minimal record
                                                         ("config", ("catalog", "dataset", "contact_point"), "not kind or card", AttributeError),
@@ -14,11 +23,11 @@ from test_utils import FDPCatalog, resolve_path, adapted_instance, is_list_field
                                                         ("api_data", (["challenge_title"]), [], ValueError), # Empty list in mandatory field
                                                         ("config", ("catalog", "dataset", "contact_point", "fn"), 'something "in quotes" \'excapedquo\'beep', None), # Quotes in string in config file
                                                         ("config", ("catalog", "homepage"), "", None),
-                                                        ("config", ("catalog", "contact_point", "hasEmail"), "mailto:email@org.org", None)])
+                                                        ("config", ("catalog", "contact_point", "hasEmail"), "mailto:email@org.org", None)], ids=param_id)
 def test_metadata_model_creation(target, config, api_data, path, value, exception):
     """General test for creating a valid instance of the metadata schema"""
     if exception:
-        with pytest.raises(exception) as exc_info:
+        with pytest.raises(exception):
             schema = adapted_instance(target, config, api_data, path, value)
             schema.validate()
             match target:
@@ -33,7 +42,6 @@ def test_metadata_model_creation(target, config, api_data, path, value, exceptio
                 assert target == value
             else:
                 assert target == None            
-        print(exc_info)
         
     else:
         schema = adapted_instance(target, config, api_data, path, value)
@@ -64,21 +72,20 @@ def test_metadata_model_creation(target, config, api_data, path, value, exceptio
                                                         ("config", ("catalog", "contact_point", "fn"),"Firstname Lastname",None),
                                                         ("api_data", (["archive_title"]), 123, ValidationError),
                                                         ("api_data", (["distribution_size"]), "drie", ValidationError),
-                                                        ("api_data", (["archive_title"]), "title", None)])
+                                                        ("api_data", (["archive_title"]), "title", None)], ids=param_id)
 def test_data_types(target, config, api_data, path, value, exception):
     """Tests if basic types are enforced correctly"""
     schema = adapted_instance(target, config, api_data, path, value)
     if exception:
-        with pytest.raises(exception) as exc_info:
+        with pytest.raises(exception):
             schema.validate() # Bad error: if type is ambigious (Kind | HRIVCard for example) it prints errors for both
-        print(exc_info)
     else:
         schema.validate()
 
 @pytest.mark.parametrize("target,path,value,exception,message",[("config", ("catalog", "dataset", "theme"), ["HEAL"], None, None),
-                                                        ("config", ("catalog", "dataset", "theme"), ["INVALID_THEME"], ValueError, f"INVALID_THEME incorrect or not supported. Supported values: {', '.join(metadata_model.themes.keys())}"),
+                                                        ("config", ("catalog", "dataset", "theme"), ["INVALID_THEME"], ValueError, _THEME_MSG),
                                                         ("config", ("catalog", "dataset", "access_rights"), "public", None, None),
-                                                        ("config", ("catalog", "dataset", "access_rights"), "NOT_ALLOWED", ValueError, f"NOT_ALLOWED incorrect or not supported. Supported values: {', '.join(metadata_model.access_rights.keys())}"),
+                                                        ("config", ("catalog", "dataset", "access_rights"), "NOT_ALLOWED", ValueError, _ACCESS_RIGHTS_MSG),
                                                         ("config", ("catalog", "dataset", "theme"), "HEAL", None, None),
                                                         ("config", ("catalog", "dataset", "theme"), "BAD", ValueError, None),
                                                         ("config", ("catalog", "language"), "Eng", None, None),
@@ -90,7 +97,7 @@ def test_data_types(target, config, api_data, path, value, exception):
                                                         ("config", ("catalog", "license"), "cc_byncsa_30", None, None),
                                                         ("config", ("catalog", "license"), "Apache-2.0", ValueError, None),
                                                         ("config", ("catalog", "dataset", "distribution", "status"), "develoP", None, None),
-                                                        ("config", ("catalog", "dataset", "distribution", "status"), "asfd", ValueError, None)])
+                                                        ("config", ("catalog", "dataset", "distribution", "status"), "asfd", ValueError, None)], ids=param_id)
 def test_string_to_enum(target, config, api_data, path, value, exception, message):
     """Tests string_to_enum function"""
     schema = adapted_instance(target, config, api_data, path, value)
@@ -99,9 +106,8 @@ def test_string_to_enum(target, config, api_data, path, value, exception, messag
             with pytest.raises(exception, match=message):
                 MetadataRecord._string_to_enum(schema)
         else:
-            with pytest.raises(exception) as exc_info:
+            with pytest.raises(exception):
                 MetadataRecord._string_to_enum(schema) # Prints good error
-            print(exc_info)
     else:
         MetadataRecord._string_to_enum(schema)
 
@@ -112,17 +118,16 @@ def test_string_to_enum(target, config, api_data, path, value, exception, messag
                                                         ("config", ("catalog", "contact_point", "hasUrl"), ["no url"], ValueError),
                                                         ("config", ("catalog", "contact_point", "hasUrl"), None, None),
                                                         ("config", ("catalog", "contact_point"), [schema_definitions_hri.Kind(hasEmail="email@email.com", fn="name"), HRIVCard(hasEmail="email@email.com", formatted_name="name")], None),
-                                                        ("config", ("catalog", "contact_point"), [schema_definitions_hri.Kind(hasEmail="email@email.com", fn="name"), HRIVCard(hasEmail="email@email.com", formatted_name="name"), "random"], ValueError)])
-def test_kind_to_hrivcard(target, config, api_data, path, value, exception):
+                                                        ("config", ("catalog", "contact_point"), [schema_definitions_hri.Kind(hasEmail="email@email.com", fn="name"), HRIVCard(hasEmail="email@email.com", formatted_name="name"), "random"], ValueError)], ids=param_id)
+def test_kind_to_hrivcard(target, minimal_config, api_data, path, value, exception):
     """Tests the transformation function from Kind to HRIVCard"""
-    schema = adapted_instance(target, config, api_data, path, value)
+    schema = adapted_instance(target, minimal_config, api_data, path, value)
     if exception:
-        with pytest.raises(exception) as exc_info:
+        with pytest.raises(exception):
             MetadataRecord._kind_to_HRIVCard(schema) # Prints good error
-        print(exc_info)
     else:
         MetadataRecord._kind_to_HRIVCard(schema)
-        target = resolve_path(schema, path[:-1], target, config)
+        target = resolve_path(schema, path[:-1], target, minimal_config)
         try:
             assert isinstance(target, HRIVCard)
         except:
@@ -148,14 +153,13 @@ def test_kind_to_hrivcard(target, config, api_data, path, value, exception):
                                                         ("config", ("catalog", "dataset", "publisher", "publisher_type"), "https://publishertype.com", None),
                                                         ("config", ("catalog", "dataset", "publisher", "publisher_type"), ["https://publishertype.com"], ValueError), # Publisher type in a list when it's not supposed to be
                                                         ("config", ("catalog", "publisher"), [metadata_model.Agent(mbox="dummy@email.com",identifier=["id"],name=["name"],homepage="https://pagina.nl"), HRIAgent(name=["name"],identifier=["id"],mbox="email@email.com",homepage="https://pagina.nl")], None),
-                                                        ("config", ("catalog", "publisher"), [metadata_model.Agent(mbox="dummy@email.com",identifier=["id"],name=["name"],homepage="https://pagina.nl"), HRIAgent(name=["name"],identifier=["id"],mbox="email@email.com",homepage="https://pagina.nl"), "random"], ValueError)]) # Not Agent in list
+                                                        ("config", ("catalog", "publisher"), [metadata_model.Agent(mbox="dummy@email.com",identifier=["id"],name=["name"],homepage="https://pagina.nl"), HRIAgent(name=["name"],identifier=["id"],mbox="email@email.com",homepage="https://pagina.nl"), "random"], ValueError)], ids=param_id) # Not Agent in list
 def test_agent_to_hriagent(target, config, api_data, path, value, exception):
     """Tests the tranformation function from Agent to HRIAgent"""
     schema = adapted_instance(target, config, api_data, path, value)
     if exception:
-        with pytest.raises(exception) as exc_info:
+        with pytest.raises(exception):
             MetadataRecord._agent_to_HRIAgent(schema) # Prints good error
-        print(exc_info)
     else:
         MetadataRecord._agent_to_HRIAgent(schema)
         target = resolve_path(schema, path[:-1], target, config)
@@ -170,14 +174,14 @@ def test_agent_to_hriagent(target, config, api_data, path, value, exception):
         elif path[-1] == "spatial":
             assert target.spatial is not None
 
-@pytest.mark.parametrize("target,path,value,exception,message",[("api_data", (["challenge_title"]), None, ValueError, "Likely put null or null equivalent value in required field"),
+@pytest.mark.parametrize("target,path,value,exception,message",[("api_data", (["challenge_title"]), None, ValueError, _NULL_FIELD_MSG),
                                                         ("api_data", (["challenge_title"]), "title", None, None),
                                                         ("config", ("catalog", "license"), None, None, None),
                                                         ("config", ("catalog", "license"), "cc0", None, None),
-                                                        ("config", ("catalog", "dataset", "contact_point", "fn"), None, ValueError, "Likely put null or null equivalent value in required field"),
+                                                        ("config", ("catalog", "dataset", "contact_point", "fn"), None, ValueError, _NULL_FIELD_MSG),
                                                         ("config", ("catalog", "contact_point", "fn"), "", ValueError, None),
-                                                        ("api_data", (["challenge_title"]), [], ValueError, "Likely put null or null equivalent value in required field"),
-                                                        ("config", ("catalog", "license"), "", None, None)])
+                                                        ("api_data", (["challenge_title"]), [], ValueError, _NULL_FIELD_MSG),
+                                                        ("config", ("catalog", "license"), "", None, None)], ids=param_id)
 def test_drop_none(target, config, api_data, path, value, exception,message):
     """Tests if drop_none function removes null-equivalent values and doesn't interfere with validation function"""
     schema = adapted_instance(target, config, api_data, path, value)
@@ -186,9 +190,8 @@ def test_drop_none(target, config, api_data, path, value, exception,message):
             with pytest.raises(exception, match=message):
                 schema.validate()
         else:
-            with pytest.raises(exception) as exc_info:
+            with pytest.raises(exception):
                 schema.validate() # Good error
-            print(exc_info)
     else:
         schema.validate()
         match target:
@@ -210,7 +213,7 @@ def test_drop_none(target, config, api_data, path, value, exception,message):
                                                         ("config", ("catalog", "dataset", "purpose"), "purposefield", None, None),
                                                         ("config", ("catalog", "dataset", "purpose"), ["purpose field", "purpose_2"], None, None),
                                                         ("api_data", (["challenge_url"]), ["idee"], None, None), # Warning?
-                                                        ("api_data", (["challenge_url"]), ["idee2", "illegal_id"], TypeError, "Found list where it is not supposed to be: identifier")])
+                                                        ("api_data", (["challenge_url"]), ["idee2", "illegal_id"], TypeError, _LIST_MSG)], ids=param_id)
 def test_ensure_lists(target, config, api_data, path, value, exception, message):  
     """Tests the function that creates lists where it needs to be, and removes lists where they don't need to be"""  
     schema = adapted_instance(target, config, api_data, path, value)
@@ -219,9 +222,8 @@ def test_ensure_lists(target, config, api_data, path, value, exception, message)
             with pytest.raises(exception, match=message):
                 MetadataRecord._ensure_lists(schema)
         else:
-            with pytest.raises(exception) as exc_info:
+            with pytest.raises(exception):
                 MetadataRecord._ensure_lists(schema) # Prints good error
-            print(exc_info)
     else:
         MetadataRecord._ensure_lists(schema)
         match target:
@@ -239,29 +241,27 @@ def test_ensure_lists(target, config, api_data, path, value, exception, message)
         else:
             assert not isinstance(target, list)
 
-@pytest.mark.parametrize("target,path,value,exception",[(None, None, None, None),])
+@pytest.mark.parametrize("target,path,value,exception",[(None, None, None, None),], ids=param_id)
 def test_transformation_hri(target, config, api_data, path, value, exception):
     """Tests transformation from unprocessed MetadataRecord to HRI schema"""
     schema = adapted_instance(target, config, api_data, path, value)
     schema.transform_schema()
-    disallowed_fields = {"distribution", "dataset"}
-    filtered_fields = {k: v for k, v in vars(schema.catalog).items() if k not in disallowed_fields and v is not None}
-    catalog = FDPCatalog(
+    # The fields were already validated on the way into the schema, so
+    # model_construct skips pydantic re-validation of the rebuilt models.
+    catalog = fdp_catalog_cls().model_construct(
         is_part_of=[URIRef("https://test.com")],
         dataset=[],
-        **filtered_fields)
+        **_filtered_fields(schema.catalog))
     for dataset in schema.catalog.dataset:
-        filtered_fields = {k: v for k, v in vars(dataset).items() if k not in disallowed_fields and v is not None}
-        hri_dataset = HRIDataset(
-            **filtered_fields
+        hri_dataset = HRIDataset.model_construct(
+            **_filtered_fields(dataset)
         )
         for distribution in dataset.distribution:
-            filtered_fields = {k: v for k, v in vars(distribution).items() if k not in disallowed_fields and v is not None}
-            hri_distribution = HRIDistribution(
-                **filtered_fields
+            hri_distribution = HRIDistribution.model_construct(
+                **_filtered_fields(distribution)
             )
 
-@pytest.mark.parametrize("target,path,value",[("multi_conf", None, None)])
+@pytest.mark.parametrize("target,path,value",[("multi_conf", None, None)], ids=param_id)
 def test_extra_configs(target, config, api_data, path, value, extra_config):
     """Tests if multiple config files are handled correctly"""
     schema = adapted_instance(target, config, api_data, path, value, extra_config)
@@ -1,29 +1,56 @@
+import functools
+import operator
+import re
 import pytest
-from fairmeta.metadata_model import MetadataRecord
+from fairmeta.metadata_model import MetadataRecord, _annotation_allows_list
 from copy import deepcopy
-from pydantic import AnyHttpUrl, Field
-from sempyro.hri_dcat import HRICatalog
-from rdflib import DCTERMS
-
-class FDPCatalog(HRICatalog):
-    is_part_of: [AnyHttpUrl] = Field(
-        description="Link to parent object", 
-        json_schema_extra={
-            "rdf_term": DCTERMS.isPartOf, 
-            "rdf_type": "uri"
-        })
-    
-def extend_dict(dictionary: dict, extension: dict) -> dict:
-    """Extends a nested dictionary with another nested dictionary preserving structure"""
-    for key, value in extension.items():
-        if key in dictionary and isinstance(dictionary[key], dict) and isinstance(value, dict):
-            extend_dict(dictionary[key], value)
-        else:
-            dictionary[key] = value
-    return dictionary
+
+def param_id(value):
+    """Builds a stable, readable test id fragment for a parametrize argument"""
+    if value is None:
+        return "None"
+    if isinstance(value, type):
+        return value.__name__
+    if isinstance(value, (tuple, list)):
+        return "+".join(param_id(v) for v in value)
+    if isinstance(value, re.Pattern):
+        return value.pattern[:40]
+    return str(value)[:40]
+
+@functools.cache
+def fdp_catalog_cls():
+    """Builds the FDPCatalog test model on first use instead of at import"""
+    from pydantic import AnyHttpUrl, Field
+    from sempyro.hri_dcat import HRICatalog
+    from rdflib import DCTERMS
+
+    class FDPCatalog(HRICatalog):
+        is_part_of: [AnyHttpUrl] = Field(
+            description="Link to parent object",
+            json_schema_extra={
+                "rdf_term": DCTERMS.isPartOf,
+                "rdf_type": "uri"
+            })
+
+    return FDPCatalog
+
+
+# Results of extract_paths per config dict. Keyed by id because dicts are
+# not hashable; the dict itself is kept in the entry so its id cannot be
+# reused for another object.
+_extract_paths_cache = {}
 
 def extract_paths(config, key):
     """Returns what the path to a field would be if it was in config"""
+    entry = _extract_paths_cache.get(id(config))
+    if entry is None:
+        entry = _extract_paths_cache[id(config)] = (config, {})
+    results = entry[1]
+    if key not in results:
+        results[key] = _extract_paths(config, key)
+    return results[key]
+
+def _extract_paths(config, key):
     path = []
     for k, v in config.items():
         if k == "mapping":
@@ -33,52 +60,89 @@ def extract_paths(config, key):
             value = extract_paths(v, key)
             if value != []:
                 path.append(k)
-                path.extend(extract_paths(v, key))
+                path.extend(value)
     return path
 
+@functools.cache
+def _path_walker(path):
+    """Builds a walker with prebound attribute getters for a path tuple"""
+    getters = tuple(operator.attrgetter(key) for key in path)
+
+    def walk(obj):
+        for getter in getters:
+            obj = getter(obj)
+            if isinstance(obj, list):
+                obj = obj[0]
+        return obj
+
+    return walk
+
+def _resolve_config(obj, path, config):
+    return _path_walker(tuple(path))(obj)
+
+def _resolve_api_data(obj, path, config):
+    internal_path = extract_paths(config, path[0])
+    obj = _path_walker(tuple(internal_path[:-1]))(obj)
+    return getattr(obj, internal_path[-1]), internal_path
+
+_RESOLVERS = {"config": _resolve_config, "api_data": _resolve_api_data}
+
 def resolve_path(obj, path, target, config):
-    """Returns the value of a field in config or api_data""" 
-    match target:
-        case "config":
-            for key in path:
-                obj = getattr(obj, key)
-                if isinstance(obj, list):
-                    obj = obj[0]
-            return obj
-        
-        case "api_data":
-            key = path[0]
-            internal_path = extract_paths(config, key)
-            for subkey in internal_path[:-1]:
-                obj = getattr(obj, subkey)
-                if isinstance(obj, list):
-                    obj = obj[0]
-            obj = getattr(obj, internal_path[-1])
-            return obj, internal_path
-        case _:
-            raise ValueError
+    """Returns the value of a field in config or api_data"""
+    resolver = _RESOLVERS.get(target)
+    if resolver is None:
+        raise ValueError
+    return resolver(obj, path, config)
 
-def adapted_instance(target, config, api_data, path, value, extra_config=None):
-    """Changes a field in config or api_data and creates an FDPBase with that"""
-    match target:
-        case "config":
-            adapted_data = deepcopy(config) 
-        case "api_data":
-            adapted_data = deepcopy(api_data) 
-        case "multi_conf":
-            return MetadataRecord.create_metadata_schema_instance([config, extra_config], api_data)
-        case _:
-            return MetadataRecord.create_metadata_schema_instance([config], api_data)
-    
-    d = adapted_data
+# Unmodified baseline instances per (config, api_data) pair, so repeated
+# "no adaptation" parametrizations clone a finished instance instead of
+# rebuilding it. Entries are compared by equality because the fixtures hand
+# out fresh copies of the same session-built base to every test.
+_baseline_cache = []
+
+def _baseline_instance(config, api_data):
+    """Returns a deep copy of the cached unmodified instance for this input"""
+    for cached_config, cached_api_data, instance in _baseline_cache:
+        if cached_config == config and cached_api_data == api_data:
+            return deepcopy(instance)
+    cached_config = deepcopy(config)
+    cached_api_data = deepcopy(api_data)
+    instance = MetadataRecord.create_metadata_schema_instance([cached_config], cached_api_data)
+    _baseline_cache.append((cached_config, cached_api_data, instance))
+    return deepcopy(instance)
+
+def _cow_set(data, path, value):
+    """Sets a nested value, copying only the dicts along the path"""
+    adapted = dict(data)
+    d = adapted
     for key in path[:-1]:
+        d[key] = dict(d[key])
         d = d[key]
     d[path[-1]] = value
-    
-    if target == "config":
-        return MetadataRecord.create_metadata_schema_instance([adapted_data], api_data)
-    else:
-        return MetadataRecord.create_metadata_schema_instance([config], adapted_data)
+    return adapted
+
+def _adapt_config(config, api_data, path, value):
+    return MetadataRecord.create_metadata_schema_instance([_cow_set(config, path, value)], api_data)
+
+def _adapt_api_data(config, api_data, path, value):
+    return MetadataRecord.create_metadata_schema_instance([config], _cow_set(api_data, path, value))
+
+_ADAPTERS = {"config": _adapt_config, "api_data": _adapt_api_data}
+
+def adapted_instance(target, config, api_data, path, value, extra_config=None):
+    """Changes a field in config or api_data and creates an FDPBase with that"""
+    if target == "multi_conf":
+        return MetadataRecord.create_metadata_schema_instance([config, extra_config], api_data)
+    adapter = _ADAPTERS.get(target)
+    if adapter is None:
+        return _baseline_instance(config, api_data)
+    return adapter(config, api_data, path, value)
+
+@functools.cache
+def _list_fields(cls) -> frozenset:
+    """The names of a model's fields whose annotation allows a list"""
+    return frozenset(name for name, field in cls.model_fields.items()
+                     if _annotation_allows_list(field.annotation))
 
 def is_list_field(model: MetadataRecord, path):
     """Helper function to decide if a field should be a list"""
@@ -86,5 +150,4 @@ def is_list_field(model: MetadataRecord, path):
         model = getattr(model, key)
         if isinstance(model, list):
             model = model[0]
-    field = model.__class__.model_fields[path[-1]]
-    return 'List' in str(field.annotation)
\ No newline at end of file
+    return path[-1] in _list_fields(model.__class__)
\ No newline at end of file